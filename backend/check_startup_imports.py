@@ -0,0 +1,73 @@
+"""Report what importing server.py costs, per top-level import, and fail if it regresses.
+
+    python check_startup_imports.py [--budget-ms 1500] [--top 15]
+
+Runs `python -X importtime -c "import server"` in a fresh interpreter. Exits non-zero if the total import
+time exceeds the budget, or if any module that server.py loads lazily was imported at startup.
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Must only load on first use (see LazyModule in server.py)
+LAZY_MODULES = ["numpy", "cv2", "PIL", "reportlab", "pypdf", "httpx"]
+DEFAULT_BUDGET_MS = 1500
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure():
+    """(module, self_us, cumulative_us, depth) for every import, in import order"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing server failed:\n{result.stderr}")
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    imports = measure()
+    server_ms = next(cumulative for module, _, cumulative, _ in imports if module == "server") / 1000
+    top_level = sorted(
+        (entry for entry in imports if entry[3] == 1),
+        key=lambda entry: entry[2],
+        reverse=True
+    )
+
+    print(f"import server: {server_ms:.0f}ms (budget {args.budget_ms:.0f}ms)")
+    print(f"{'cumulative':>12} {'self':>8}  module")
+    for module, self_us, cumulative_us, _ in top_level[:args.top]:
+        print(f"{cumulative_us / 1000:10.1f}ms {self_us / 1000:6.1f}ms  {module}")
+
+    failures = []
+    loaded = {module.split(".")[0] for module, _, _, _ in imports}
+    eager = [module for module in LAZY_MODULES if module in loaded]
+    if eager:
+        failures.append(f"lazy modules imported at startup: {', '.join(eager)}")
+    if server_ms > args.budget_ms:
+        failures.append(f"import took {server_ms:.0f}ms, over the {args.budget_ms:.0f}ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
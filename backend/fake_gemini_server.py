@@ -0,0 +1,53 @@
+"""
+Fake Gemini API for local testing of the report chat assistant.
+
+Implements the two REST routes server.py calls and answers with a canned
+reply, streamed word by word. Run it and point the backend at it:
+
+    uvicorn fake_gemini_server:app --port 8001
+    GEMINI_API_BASE_URL=http://localhost:8001/v1beta uvicorn server:app
+
+FAKE_GEMINI_LATENCY_SECONDS sets the delay before the first chunk and
+FAKE_GEMINI_CHUNK_DELAY_SECONDS the delay between chunks.
+"""
+import asyncio
+import json
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+LATENCY_SECONDS = float(os.environ.get('FAKE_GEMINI_LATENCY_SECONDS', '0.2'))
+CHUNK_DELAY_SECONDS = float(os.environ.get('FAKE_GEMINI_CHUNK_DELAY_SECONDS', '0.05'))
+
+app = FastAPI(title="Fake Gemini API")
+
+def fake_answer(body: dict) -> str:
+    prompt = body["contents"][-1]["parts"][0]["text"]
+    question = prompt.split("Question: ", 1)[-1].split("\n", 1)[0]
+    return (
+        f"This is a simulated answer to: \"{question}\". "
+        "Based on the report, there are no findings that need urgent attention. "
+        "This is not medical advice; please discuss your results with your doctor."
+    )
+
+def candidate(text: str) -> dict:
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}]}
+
+@app.post("/v1beta/models/{model}:generateContent")
+async def generate_content(model: str, request: Request):
+    body = await request.json()
+    await asyncio.sleep(LATENCY_SECONDS)
+    return candidate(fake_answer(body))
+
+@app.post("/v1beta/models/{model}:streamGenerateContent")
+async def stream_generate_content(model: str, request: Request):
+    body = await request.json()
+
+    async def events():
+        await asyncio.sleep(LATENCY_SECONDS)
+        for word in fake_answer(body).split(" "):
+            yield f"data: {json.dumps(candidate(word + ' '))}\r\n\r\n"
+            await asyncio.sleep(CHUNK_DELAY_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -0,0 +1,29 @@
+"""Recompute the pathology analytics rollups from the reports collection.
+
+Run after backfills, imports or manual report edits that bypassed the API:
+
+    python rebuild_pathology_rollups.py --from 2024-01-01 --to 2024-02-01
+
+Without --from/--to every day is rebuilt. Rebuild past days while reports for them are not being created.
+"""
+import argparse
+import asyncio
+from datetime import date
+
+from server import client, rebuild_pathology_rollups
+
+
+async def main(from_day, to_day):
+    try:
+        written = await rebuild_pathology_rollups(from_day, to_day)
+        print(f"Rebuilt {written} rollup documents")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--from", dest="from_day", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="to_day", type=date.fromisoformat, help="Day after the last one to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+    asyncio.run(main(args.from_day, args.to_day))
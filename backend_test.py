@@ -5,13 +5,39 @@ Tests all FastAPI endpoints with proper authentication and data flow
 """
 
 import requests
+import os
 import sys
 import json
+import re
 import base64
 import io
+import zipfile
 from datetime import datetime
 from pathlib import Path
 
+def text_pdf(lines):
+    """One-page PDF with each line drawn in Helvetica, with a correct xref table so it parses without repair"""
+    content = "BT /F1 12 Tf 72 720 Td 16 TL " + " ".join(
+        "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") Tj T*" for line in lines
+    ) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF"
+    return pdf.encode('latin-1')
+
 class RadPortalAPITester:
     def __init__(self, base_url="https://1b4ee4c9-9fc9-4c9f-a5f1-dcf2a608661e.preview.emergentagent.com/api"):
         self.base_url = base_url
@@ -101,6 +127,16 @@ class RadPortalAPITester:
         )
         return success
 
+    def test_readiness_check(self):
+        """Test readiness endpoint (indexes built)"""
+        success, response = self.run_test(
+            "Readiness Check",
+            "GET",
+            "health/ready",
+            200
+        )
+        return success
+
     def test_register_user(self):
         """Test user registration"""
         timestamp = datetime.now().strftime('%H%M%S')
@@ -154,6 +190,125 @@ class RadPortalAPITester:
         
         return success
 
+    def mongo_db(self):
+        """Direct handle on the server's database, for tests that must plant or inspect stored state"""
+        from pymongo import MongoClient
+        client = MongoClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
+        return client[os.environ.get('DB_NAME', 'test_database')]
+
+    def test_login_rehash(self):
+        """Test login upgrades a password hash stored at a different bcrypt cost, then leaves it alone"""
+        from passlib.hash import bcrypt
+        timestamp = datetime.now().strftime('%H%M%S%f')
+        email = f"rehash_{timestamp}@hospital.com"
+        password = "RehashPass123!"
+        
+        print(f"\n🔍 Testing Login Rehash...")
+        
+        try:
+            response = requests.post(f"{self.base_url}/auth/register",
+                                     json={"email": email, "password": password, "full_name": "Dr. Rehash"})
+            if response.status_code != 200:
+                self.log_test("Login Rehash", False, f"Register status: {response.status_code}")
+                return False
+            
+            users = self.mongo_db().users
+            current_hash = users.find_one({"email": email})["password_hash"]
+            current_rounds = bcrypt.from_string(current_hash).rounds
+            # Plant a hash at another cost, as if BCRYPT_ROUNDS had changed since the user registered
+            old_hash = bcrypt.using(rounds=5 if current_rounds == 4 else 4).hash(password)
+            users.update_one({"email": email}, {"$set": {"password_hash": old_hash}})
+            
+            statuses = []
+            hashes = []
+            for _ in range(2):
+                response = requests.post(f"{self.base_url}/auth/login", json={"email": email, "password": password})
+                statuses.append(response.status_code)
+                hashes.append(users.find_one({"email": email})["password_hash"])
+            
+            upgraded = hashes[0] != old_hash and bcrypt.from_string(hashes[0]).rounds == current_rounds
+            success = statuses == [200, 200] and upgraded and bcrypt.verify(password, hashes[0]) and hashes[1] == hashes[0]
+            self.log_test("Login Rehash", success, f"Statuses: {statuses}, upgraded: {upgraded}, stable: {hashes[1] == hashes[0]}")
+            return success
+            
+        except Exception as e:
+            self.log_test("Login Rehash", False, f"Exception: {str(e)}")
+            return False
+
+    def test_revoke_tokens(self):
+        """Test tokens issued before revoke-tokens get 401 while the returned token keeps working"""
+        timestamp = datetime.now().strftime('%H%M%S%f')
+        url = f"{self.base_url}/analytics/pathology"
+        
+        print(f"\n🔍 Testing Revoke Tokens...")
+        
+        try:
+            response = requests.post(f"{self.base_url}/auth/register", json={
+                "email": f"revoke_{timestamp}@hospital.com", "password": "RevokePass123!", "full_name": "Dr. Revoke"
+            })
+            if response.status_code != 200:
+                self.log_test("Revoke Tokens", False, f"Register status: {response.status_code}")
+                return False
+            old = {'Authorization': f"Bearer {response.json()['access_token']}"}
+            
+            # Use the old token first so the server has the user cached when the revocation lands
+            before = requests.get(url, headers=old).status_code
+            response = requests.post(f"{self.base_url}/auth/revoke-tokens", headers=old)
+            if response.status_code != 200:
+                self.log_test("Revoke Tokens", False, f"Revoke status: {response.status_code}")
+                return False
+            new = {'Authorization': f"Bearer {response.json()['access_token']}"}
+            
+            statuses = {
+                "before": before,
+                "old": requests.get(url, headers=old).status_code,
+                "old_revoke": requests.post(f"{self.base_url}/auth/revoke-tokens", headers=old).status_code,
+                "new": requests.get(url, headers=new).status_code,
+            }
+            success = statuses == {"before": 200, "old": 401, "old_revoke": 401, "new": 200}
+            self.log_test("Revoke Tokens", success, f"Statuses: {statuses}")
+            return success
+            
+        except Exception as e:
+            self.log_test("Revoke Tokens", False, f"Exception: {str(e)}")
+            return False
+
+    def test_login_burst_rejected(self):
+        """Test a login burst past the bcrypt queue gets 503 with Retry-After instead of queueing"""
+        if not self.created_resources['users']:
+            return False
+        
+        from concurrent.futures import ThreadPoolExecutor
+        login_data = {"email": self.created_resources['users'][0]['email'], "password": "TestPass123!"}
+        url = f"{self.base_url}/auth/login"
+        
+        print(f"\n🔍 Testing Login Burst Rejected...")
+        print(f"   URL: {url}")
+        
+        try:
+            # Far more concurrent logins than the default pool and queue (2 workers, 32 pending) take at cost 12
+            with ThreadPoolExecutor(max_workers=128) as pool:
+                responses = list(pool.map(lambda _: requests.post(url, json=login_data), range(128)))
+            statuses = [response.status_code for response in responses]
+            rejected = [response for response in responses if response.status_code == 503]
+            
+            # The pool drains and serves logins again afterwards
+            after = requests.post(url, json=login_data).status_code
+            
+            success = (
+                bool(rejected)
+                and all(response.headers.get('Retry-After') for response in rejected)
+                and set(statuses) <= {200, 503}
+                and after == 200
+            )
+            self.log_test("Login Burst Rejected", success,
+                          f"200: {statuses.count(200)}, 503: {len(rejected)}, after burst: {after}")
+            return success
+            
+        except Exception as e:
+            self.log_test("Login Burst Rejected", False, f"Exception: {str(e)}")
+            return False
+
     def test_create_patient(self):
         """Test patient creation"""
         timestamp = datetime.now().strftime('%H%M%S')
@@ -179,6 +334,75 @@ class RadPortalAPITester:
         
         return success
 
+    def test_import_patients(self):
+        """Test streaming CSV patient import with a per-row error report"""
+        timestamp = datetime.now().strftime('%H%M%S')
+        csv_body = "\n".join([
+            "patient_id,name,age,gender,clinical_notes",
+            f'I{timestamp}-1,"Import, Patient One",52,Female,"Follow-up ""routine"""',
+            f"I{timestamp}-2,Import Patient Two,61,Male,",
+            f"I{timestamp}-3,Import Patient Three,not-a-number,Male,",
+        ])
+        url = f"{self.base_url}/patients/import"
+        headers = {'Authorization': f'Bearer {self.token}', 'Content-Type': 'text/csv'}
+        
+        print(f"\n🔍 Testing Import Patients...")
+        print(f"   URL: {url}")
+        
+        try:
+            response = requests.post(url, data=csv_body.encode('utf-8'), headers=headers)
+            result = response.json() if response.status_code == 200 else {}
+            success = (
+                response.status_code == 200
+                and result.get('inserted') == 2
+                and result.get('failed') == 1
+                and result['errors'][0]['line'] == 4
+            )
+            self.log_test(
+                "Import Patients",
+                success,
+                f"Status: {response.status_code}, Inserted: {result.get('inserted')}, Failed: {result.get('failed')}"
+            )
+            return success
+            
+        except Exception as e:
+            self.log_test("Import Patients", False, f"Exception: {str(e)}")
+            return False
+
+    def test_import_patients_over_limit(self):
+        """Test a chunked import body just past the server's size limit is rejected with 413"""
+        url = f"{self.base_url}/patients/import"
+        headers = {'Authorization': f'Bearer {self.token}', 'Content-Type': 'text/csv'}
+        chunk = "".join(f"L{i},Limit Patient,40,Female\n" for i in range(1000)).encode('utf-8')
+        
+        print(f"\n🔍 Testing Import Patients Over Limit...")
+        print(f"   URL: {url}")
+        
+        try:
+            # A declared length past any limit is refused before the body is read, and the detail names the limit
+            probe = requests.post(url, headers={**headers, 'Content-Length': str(2 ** 40)})
+            match = re.search(r"(\d+) byte limit", probe.text)
+            if probe.status_code != 413 or not match:
+                self.log_test("Import Patients Over Limit", False, f"Probe status: {probe.status_code}")
+                return False
+            limit = int(match.group(1))
+            
+            def body():
+                # No Content-Length, so the limit is only found while streaming; stop one chunk past it
+                sent = 0
+                while sent <= limit:
+                    yield chunk
+                    sent += len(chunk)
+            
+            response = requests.post(url, data=body(), headers=headers)
+            success = response.status_code == 413
+            self.log_test("Import Patients Over Limit", success, f"Status: {response.status_code}, limit: {limit}")
+            return success
+            
+        except Exception as e:
+            self.log_test("Import Patients Over Limit", False, f"Exception: {str(e)}")
+            return False
+
     def test_get_patient_history(self):
         """Test getting patient history"""
         if not self.created_resources['patients']:
@@ -200,6 +424,60 @@ class RadPortalAPITester:
         
         return success
 
+    def test_patient_history_pagination(self):
+        """Test paging a patient's history with limit/cursor returns every report exactly once"""
+        timestamp = datetime.now().strftime('%H%M%S')
+        patient_id = f"H{timestamp}"
+        headers = {'Authorization': f'Bearer {self.token}'}
+        
+        print(f"\n🔍 Testing Patient History Pagination...")
+        
+        try:
+            response = requests.post(f"{self.base_url}/patients", headers=headers,
+                                     json={"patient_id": patient_id, "name": "History Patient", "age": 60, "gender": "Female"})
+            if response.status_code != 200:
+                self.log_test("Patient History Pagination", False, f"Create patient status: {response.status_code}")
+                return False
+            
+            created = []
+            for i in range(5):
+                files = {'image': (f'history_{i}.jpg', self.create_test_image(), 'image/jpeg')}
+                response = requests.post(f"{self.base_url}/reports", headers=headers,
+                                         data={'patient_id': patient_id}, files=files)
+                if response.status_code != 200:
+                    self.log_test("Patient History Pagination", False, f"Create report status: {response.status_code}")
+                    return False
+                created.append(response.json()['id'])
+            
+            # 5 reports at 2 per page: two full pages with a cursor, then a last page of one without
+            seen, pages, cursor = [], 0, None
+            while True:
+                params = {'limit': 2, 'summary': 'true'}
+                if cursor:
+                    params['cursor'] = cursor
+                response = requests.get(f"{self.base_url}/patients/{patient_id}", headers=headers, params=params)
+                if response.status_code != 200 or pages > len(created):
+                    self.log_test("Patient History Pagination", False, f"Status: {response.status_code}, pages: {pages}")
+                    return False
+                page = response.json()
+                pages += 1
+                if len(page['reports']) > 2 or any('ai_generated_report' in report for report in page['reports']):
+                    self.log_test("Patient History Pagination", False, f"Unexpected page: {page['reports']}")
+                    return False
+                seen.extend(report['id'] for report in page['reports'])
+                cursor = page.get('next_cursor')
+                if not cursor:
+                    break
+            
+            success = pages == 3 and len(seen) == len(set(seen)) and set(seen) == set(created)
+            self.log_test("Patient History Pagination", success,
+                          f"Pages: {pages}, reports: {len(seen)}, unique: {len(set(seen))}, expected: {len(created)}")
+            return success
+            
+        except Exception as e:
+            self.log_test("Patient History Pagination", False, f"Exception: {str(e)}")
+            return False
+
     def create_test_image(self):
         """Create a simple test image in base64 format"""
         # Create a simple 100x100 black image
@@ -255,6 +533,75 @@ class RadPortalAPITester:
             self.log_test("Create Report with Image", False, f"Image creation error: {str(e)}")
             return False
 
+    def test_create_reports_batch(self):
+        """Test creating several reports from one multi-image upload"""
+        if not self.created_resources['patients']:
+            return False
+        
+        patient = self.created_resources['patients'][0]
+        
+        try:
+            files = [
+                ('images', (f'test_xray_{n}.jpg', self.create_test_image(), 'image/jpeg'))
+                for n in range(3)
+            ]
+            files.append(('images', ('notes.txt', io.BytesIO(b'not an image'), 'text/plain')))
+            
+            success, response = self.run_test(
+                "Create Reports Batch",
+                "POST",
+                "reports/batch",
+                200,
+                data={'patient_id': patient['patient_id']},
+                files=files
+            )
+            
+            if success:
+                print(f"   Created: {response.get('created')}, Failed: {response.get('failed')}")
+                success = response.get('created') == 3 and response.get('failed') == 1
+                if not success:
+                    self.log_test("Create Reports Batch Items", False, f"Items: {response.get('items')}")
+            
+            return success
+            
+        except Exception as e:
+            self.log_test("Create Reports Batch", False, f"Image creation error: {str(e)}")
+            return False
+
+    def test_create_report_async(self):
+        """Test async report creation and job status polling"""
+        if not self.created_resources['patients']:
+            return False
+        
+        patient = self.created_resources['patients'][0]
+        form_data = {'patient_id': patient['patient_id']}
+        files = {'image': ('test_xray.jpg', self.create_test_image(), 'image/jpeg')}
+        
+        success, response = self.run_test(
+            "Create Report Async",
+            "POST",
+            "reports?async=true",
+            202,
+            data=form_data,
+            files=files
+        )
+        if not success:
+            return False
+        
+        job_id = response['job_id']
+        print(f"   Job ID: {job_id}")
+        
+        import time
+        for _ in range(30):
+            success, job = self.run_test("Get Job Status", "GET", f"jobs/{job_id}", 200)
+            if not success or job.get('status') in ('succeeded', 'failed'):
+                break
+            time.sleep(1)
+        
+        done = success and job.get('status') == 'succeeded' and job.get('report_status') == 'draft'
+        self.log_test("Async Report Completed", done, f"Job status: {job.get('status')}")
+        return done
+
     def test_get_report(self):
         """Test getting report details"""
         if not self.created_resources['reports']:
@@ -273,10 +620,186 @@ class RadPortalAPITester:
         if success:
             print(f"   Retrieved report: {report_id}")
             print(f"   Status: {response.get('status')}")
-            print(f"   Has image data: {'image_data' in response}")
+            print(f"   Has image ref: {bool(response.get('image_ref'))}")
+        
+        return success
+
+    def test_get_report_image(self):
+        """Test streaming the report image with a byte range"""
+        if not self.created_resources['reports']:
+            return False
+        
+        report = self.created_resources['reports'][0]
+        report_id = report['id']
+        
+        url = f"{self.base_url}/reports/{report_id}/image"
+        headers = {'Authorization': f'Bearer {self.token}', 'Range': 'bytes=0-99'}
+        
+        print(f"\n🔍 Testing Get Report Image Range...")
+        print(f"   URL: {url}")
+        
+        try:
+            response = requests.get(url, headers=headers)
+            success = (
+                response.status_code == 206
+                and len(response.content) == 100
+                and response.headers.get('content-range', '').startswith('bytes 0-99/')
+            )
+            self.log_test(
+                "Get Report Image Range",
+                success,
+                f"Status: {response.status_code}, Content-Range: {response.headers.get('content-range')}"
+            )
+            return success
+                
+        except Exception as e:
+            self.log_test("Get Report Image Range", False, f"Exception: {str(e)}")
+            return False
+
+    def test_get_report_mask(self):
+        """Test decoding a single pathology mask as PNG"""
+        if not self.created_resources['reports']:
+            return False
+        
+        report = self.created_resources['reports'][0]
+        detected = list(report.get('segmentation_data', {}))
+        if not detected:
+            self.log_test("Get Report Mask", True, "No pathologies detected, nothing to decode")
+            return True
+        
+        url = f"{self.base_url}/reports/{report['id']}/masks/{detected[0]}"
+        headers = {'Authorization': f'Bearer {self.token}'}
+        
+        print(f"\n🔍 Testing Get Report Mask...")
+        print(f"   URL: {url}")
+        
+        try:
+            response = requests.get(url, headers=headers)
+            success = (
+                response.status_code == 200
+                and response.headers.get('content-type') == 'image/png'
+                and response.content.startswith(b'\x89PNG')
+            )
+            self.log_test(
+                "Get Report Mask",
+                success,
+                f"Status: {response.status_code}, Pathology: {detected[0]}, Size: {len(response.content)} bytes"
+            )
+            return success
+                
+        except Exception as e:
+            self.log_test("Get Report Mask", False, f"Exception: {str(e)}")
+            return False
+
+    def test_get_report_overlay(self):
+        """Test rendering a pathology heatmap overlay"""
+        if not self.created_resources['reports']:
+            return False
+        
+        report = self.created_resources['reports'][0]
+        detected = list(report.get('segmentation_data', {}))
+        if not detected:
+            self.log_test("Get Report Overlay", True, "No pathologies detected, nothing to render")
+            return True
+        
+        url = f"{self.base_url}/reports/{report['id']}/overlay"
+        headers = {'Authorization': f'Bearer {self.token}'}
+        params = {'pathology': detected[0], 'size': 256}
+        
+        print(f"\n🔍 Testing Get Report Overlay...")
+        print(f"   URL: {url}")
+        
+        try:
+            response = requests.get(url, headers=headers, params=params)
+            cached = requests.get(url, headers={**headers, 'If-None-Match': response.headers.get('etag', '')}, params=params)
+            success = (
+                response.status_code == 200
+                and response.headers.get('content-type') == 'image/jpeg'
+                and cached.status_code == 304
+            )
+            self.log_test(
+                "Get Report Overlay",
+                success,
+                f"Status: {response.status_code}, Revalidated: {cached.status_code}, Size: {len(response.content)} bytes"
+            )
+            return success
+                
+        except Exception as e:
+            self.log_test("Get Report Overlay", False, f"Exception: {str(e)}")
+            return False
+
+    def test_search_reports(self):
+        """Test full-text report search with a patient filter"""
+        if not self.created_resources['reports']:
+            return False
+        
+        report = self.created_resources['reports'][0]
+        url = f"{self.base_url}/reports/search"
+        headers = {'Authorization': f'Bearer {self.token}'}
+        params = {'q': 'cardiopulmonary', 'patient_id': report['patient_id'], 'limit': 5}
+        
+        print(f"\n🔍 Testing Search Reports...")
+        print(f"   URL: {url}")
+        
+        try:
+            response = requests.get(url, headers=headers, params=params)
+            results = response.json().get('results', []) if response.status_code == 200 else []
+            success = (
+                response.status_code == 200
+                and any(result['id'] == report['id'] for result in results)
+                and all(result['highlights'] for result in results)
+            )
+            self.log_test("Search Reports", success, f"Status: {response.status_code}, Results: {len(results)}")
+            return success
+            
+        except Exception as e:
+            self.log_test("Search Reports", False, f"Exception: {str(e)}")
+            return False
+
+    def test_pathology_analytics(self):
+        """Test pathology analytics served from daily rollups"""
+        if not self.created_resources['reports']:
+            return False
+        
+        success, response = self.run_test(
+            "Pathology Analytics",
+            "GET",
+            "analytics/pathology",
+            200
+        )
+        
+        if success:
+            labels = response.get('rates', {})
+            print(f"   Reports: {response.get('reports')}, Days: {len(response.get('by_day', []))}")
+            success = response.get('reports', 0) >= 1 and len(labels) == 14 and all(0 <= rate <= 1 for rate in labels.values())
+            if not success:
+                self.log_test("Pathology Analytics Rates", False, f"Reports: {response.get('reports')}, Labels: {len(labels)}")
         
         return success
 
+    def test_metrics(self):
+        """Test the Prometheus metrics endpoint reports route templates and stage timers"""
+        url = f"{self.base_url.rsplit('/api', 1)[0]}/metrics"
+        
+        print(f"\n🔍 Testing Metrics...")
+        print(f"   URL: {url}")
+        
+        try:
+            response = requests.get(url)
+            text = response.text if response.status_code == 200 else ""
+            success = (
+                response.status_code == 200
+                and 'route="/api/reports/{report_id}"' in text
+                and 'stage="get_current_user"' in text
+                and "http_requests_in_flight" in text
+            )
+            self.log_test("Metrics", success, f"Status: {response.status_code}, Lines: {len(text.splitlines())}")
+            return success
+            
+        except Exception as e:
+            self.log_test("Metrics", False, f"Exception: {str(e)}")
+            return False
+
     def test_update_report(self):
         """Test updating report content"""
         if not self.created_resources['reports']:
@@ -336,6 +859,37 @@ class RadPortalAPITester:
             self.log_test("Export Report as PDF", False, f"Exception: {str(e)}")
             return False
 
+    def test_export_reports_bulk(self):
+        """Test streaming a ZIP export of several reports"""
+        if not self.created_resources['reports']:
+            return False
+        
+        report_ids = [report['id'] for report in self.created_resources['reports']]
+        url = f"{self.base_url}/reports/export-bulk"
+        headers = {'Authorization': f'Bearer {self.token}'}
+        
+        print(f"\n🔍 Testing Bulk Export Reports...")
+        print(f"   URL: {url}")
+        
+        try:
+            response = requests.post(url, json={'report_ids': report_ids}, headers=headers)
+            if response.status_code != 200:
+                self.log_test("Bulk Export Reports", False, f"Status: {response.status_code}")
+                return False
+            
+            names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+            success = all(
+                any(name.endswith(f"report_{report_id}.pdf") for name in names)
+                and any(name.endswith(f"report_{report_id}.json") for name in names)
+                for report_id in report_ids
+            )
+            self.log_test("Bulk Export Reports", success, f"Entries: {len(names)}, Size: {len(response.content)} bytes")
+            return success
+                
+        except Exception as e:
+            self.log_test("Bulk Export Reports", False, f"Exception: {str(e)}")
+            return False
+
     def test_public_view_report(self):
         """Test public report viewing via token"""
         if not self.created_resources['reports']:
@@ -384,10 +938,90 @@ class RadPortalAPITester:
         
         return success
 
+    def gemini_generate_calls(self):
+        """Upstream Gemini requests made so far, from the server's gemini_generate stage timer"""
+        text = requests.get(f"{self.base_url.rsplit('/api', 1)[0]}/metrics").text
+        match = re.search(r'stage_duration_seconds_count\{stage="gemini_generate"\} (\d+)', text)
+        return int(match.group(1)) if match else 0
+
+    def test_public_chat_dedup(self):
+        """Test identical concurrent chat questions share one upstream call and later repeats hit the cache"""
+        if not self.created_resources['reports']:
+            return False
+        
+        from concurrent.futures import ThreadPoolExecutor
+        patient_token = self.created_resources['reports'][0]['patient_token']
+        url = f"{self.base_url}/public/chat/{patient_token}"
+        # Unique per run so earlier runs have not cached it; case and trailing punctuation normalize away
+        question = f"Is anything in report run {datetime.now().strftime('%H%M%S%f')} urgent"
+        variants = [question, question.upper() + "?", f"  {question.lower()}  ", question + "!"] * 2
+        
+        print(f"\n🔍 Testing Public Chat Dedup...")
+        print(f"   URL: {url}")
+        
+        try:
+            before = self.gemini_generate_calls()
+            with ThreadPoolExecutor(max_workers=len(variants)) as pool:
+                responses = list(pool.map(lambda query: requests.post(url, json={"query": query}), variants))
+            concurrent_calls = self.gemini_generate_calls() - before
+            
+            repeat = requests.post(url, json={"query": question})
+            repeat_calls = self.gemini_generate_calls() - before - concurrent_calls
+            
+            answers = {response.json().get('response') for response in responses + [repeat] if response.status_code == 200}
+            success = (
+                all(response.status_code == 200 for response in responses + [repeat])
+                and len(answers) == 1
+                and concurrent_calls == 1
+                and repeat_calls == 0
+            )
+            self.log_test("Public Chat Dedup", success,
+                          f"Upstream calls: {concurrent_calls} for {len(variants)} concurrent, {repeat_calls} for repeat, "
+                          f"distinct answers: {len(answers)}")
+            return success
+            
+        except Exception as e:
+            self.log_test("Public Chat Dedup", False, f"Exception: {str(e)}")
+            return False
+
+    def test_public_chat_stream(self):
+        """Test streaming AI chatbot responses over server-sent events"""
+        if not self.created_resources['reports']:
+            return False
+        
+        report = self.created_resources['reports'][0]
+        patient_token = report['patient_token']
+        url = f"{self.base_url}/public/chat/{patient_token}/stream"
+        
+        print(f"\n🔍 Testing Public Chat Stream...")
+        print(f"   URL: {url}")
+        
+        try:
+            response = requests.post(url, json={"query": "Is this serious?"}, stream=True)
+            content_type = response.headers.get('content-type', '')
+            lines = [line for line in response.iter_lines(decode_unicode=True) if line]
+            chunks = [json.loads(line[len('data: '):])['delta'] for line in lines if line.startswith('data: {"delta"')]
+            success = (
+                response.status_code == 200
+                and 'text/event-stream' in content_type
+                and len(chunks) > 0
+                and 'event: done' in lines
+            )
+            self.log_test("Public Chat Stream", success, f"Status: {response.status_code}, Chunks: {len(chunks)}")
+            return success
+            
+        except Exception as e:
+            self.log_test("Public Chat Stream", False, f"Exception: {str(e)}")
+            return False
+
     def test_pdf_upload(self):
-        """Test PDF upload and text extraction"""
-        # Create a simple test PDF content (mock)
-        pdf_content = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n>>\nendobj\nxref\n0 4\n0000000000 65535 f \n0000000009 00000 n \n0000000058 00000 n \n0000000115 00000 n \ntrailer\n<<\n/Size 4\n/Root 1 0 R\n>>\nstartxref\n174\n%%EOF"
+        """Test PDF upload, text extraction and FINDINGS/IMPRESSION sections"""
+        pdf_content = text_pdf([
+            "Chest X-ray, PA view",
+            "Findings:",
+            "Left lower lobe opacity.",
+            "IMPRESSION: Pneumonia likely.",
+        ])
         
         files = {
             'pdf_file': ('test_report.pdf', io.BytesIO(pdf_content), 'application/pdf')
@@ -404,6 +1038,14 @@ class RadPortalAPITester:
         if success:
             print(f"   Uploaded PDF report ID: {response.get('report_id')}")
             print(f"   Extracted text length: {len(response.get('extracted_text', ''))}")
+            sections = response.get('sections', {})
+            success = (
+                "Left lower lobe opacity." in response.get('extracted_text', '')
+                and sections.get('findings') == "Left lower lobe opacity."
+                and sections.get('impression') == "Pneumonia likely."
+            )
+            if not success:
+                self.log_test("PDF Extracted Sections", False, f"Sections: {sections}")
         
         return success
 
@@ -415,17 +1057,35 @@ class RadPortalAPITester:
         # Test sequence
         tests = [
             ("Health Check", self.test_health_check),
+            ("Readiness Check", self.test_readiness_check),
             ("User Registration", self.test_register_user),
             ("User Login", self.test_login_user),
+            ("Login Rehash", self.test_login_rehash),
+            ("Revoke Tokens", self.test_revoke_tokens),
+            ("Login Burst Rejected", self.test_login_burst_rejected),
             ("Create Patient", self.test_create_patient),
+            ("Import Patients", self.test_import_patients),
+            ("Import Patients Over Limit", self.test_import_patients_over_limit),
             ("Get Patient History", self.test_get_patient_history),
+            ("Patient History Pagination", self.test_patient_history_pagination),
             ("Create Report", self.test_create_report),
+            ("Create Report Async", self.test_create_report_async),
+            ("Create Reports Batch", self.test_create_reports_batch),
             ("Get Report", self.test_get_report),
+            ("Get Report Image", self.test_get_report_image),
+            ("Get Report Mask", self.test_get_report_mask),
+            ("Get Report Overlay", self.test_get_report_overlay),
+            ("Search Reports", self.test_search_reports),
+            ("Pathology Analytics", self.test_pathology_analytics),
             ("Update Report", self.test_update_report),
             ("Export Report PDF", self.test_export_report_pdf),
+            ("Bulk Export Reports", self.test_export_reports_bulk),
             ("Public View Report", self.test_public_view_report),
             ("Public Chat AI", self.test_public_chat),
+            ("Public Chat Stream", self.test_public_chat_stream),
+            ("Public Chat Dedup", self.test_public_chat_dedup),
             ("Upload PDF", self.test_pdf_upload),
+            ("Metrics", self.test_metrics),
         ]
         
         for test_name, test_func in tests:
@@ -551,6 +551,25 @@ const ReportViewer = ({ report }) => {
   const [reportText, setReportText] = useState(report.final_report);
   const [saving, setSaving] = useState(false);
   const [showSegmentation, setShowSegmentation] = useState(false);
+  const [imageUrl, setImageUrl] = useState(null);
+
+  useEffect(() => {
+    // The image is served separately from the report so metadata reads stay small. Reports whose image has
+    // not moved to the blob store have no image_ref, but the endpoint still serves them; 404 means no image
+    let objectUrl = null;
+    setImageUrl(null);
+    axios.get(`${API}/reports/${report.id}/image`, { responseType: 'blob' })
+      .then(response => {
+        objectUrl = window.URL.createObjectURL(response.data);
+        setImageUrl(objectUrl);
+      })
+      .catch(error => {
+        if (error.response?.status !== 404) console.error('Error loading image:', error);
+      });
+    return () => {
+      if (objectUrl) window.URL.revokeObjectURL(objectUrl);
+    };
+  }, [report.id]);
 
   const saveReport = async () => {
     setSaving(true);
@@ -616,10 +635,10 @@ const ReportViewer = ({ report }) => {
         </div>
         
         <div className="p-6">
-          {report.image_data && (
+          {imageUrl && (
             <div className="relative">
               <img
-                src={`data:image/jpeg;base64,${report.image_data}`}
+                src={imageUrl}
                 alt="X-ray"
                 className="w-full h-auto rounded-lg shadow"
               />
@@ -805,8 +824,10 @@ const PatientDashboard = ({ token }) => {
   const [chatMessages, setChatMessages] = useState([]);
   const [currentMessage, setCurrentMessage] = useState('');
   const [chatLoading, setChatLoading] = useState(false);
+  const [imageMissing, setImageMissing] = useState(false);
 
   useEffect(() => {
+    setImageMissing(false);
     loadReportData();
   }, [token]);
 
@@ -829,12 +850,41 @@ const PatientDashboard = ({ token }) => {
     setChatLoading(true);
     
     try {
-      const response = await axios.post(`${API}/public/chat/${token}`, {
-        query: currentMessage
+      // Stream the answer so the first words show up while Gemini is still generating
+      const response = await fetch(`${API}/public/chat/${token}/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ query: currentMessage })
       });
-      
-      const aiMessage = { role: 'assistant', content: response.data.response };
-      setChatMessages(prev => [...prev, aiMessage]);
+      if (!response.ok || !response.body) {
+        throw new Error(`Chat request failed: ${response.status}`);
+      }
+
+      setChatMessages(prev => [...prev, { role: 'assistant', content: '' }]);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+
+        for (const event of events) {
+          if (event.startsWith('event: done')) continue;
+          const dataLine = event.split('\n').find(line => line.startsWith('data: '));
+          if (!dataLine) continue;
+          const { delta } = JSON.parse(dataLine.slice('data: '.length));
+          setChatMessages(prev => {
+            const updated = [...prev];
+            const last = updated[updated.length - 1];
+            updated[updated.length - 1] = { ...last, content: last.content + delta };
+            return updated;
+          });
+        }
+      }
     } catch (error) {
       const errorMessage = { role: 'assistant', content: 'Sorry, I encountered an error. Please try again.' };
       setChatMessages(prev => [...prev, errorMessage]);
@@ -895,13 +945,15 @@ const PatientDashboard = ({ token }) => {
             </div>
 
             {/* X-Ray Image */}
-            {reportData.report.image_data && (
+            {/* Always requested: reports not yet migrated to the blob store have no image_ref */}
+            {!imageMissing && (
               <div className="bg-white rounded-lg shadow p-6">
                 <h2 className="text-xl font-semibold text-gray-900 mb-4">X-Ray Image</h2>
                 <img
-                  src={`data:image/jpeg;base64,${reportData.report.image_data}`}
+                  src={`${API}/public/view/${token}/image`}
                   alt="X-ray"
                   className="w-full h-auto rounded-lg"
+                  onError={() => setImageMissing(true)}
                 />
               </div>
             )}